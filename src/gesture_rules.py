@@ -0,0 +1,129 @@
+import json
+import math
+import os
+import numpy as np
+
+# === Settings ===
+PROFILE_PATH = "models/gesture_profile.json"
+
+# Defaults match the original hand-tuned values. The pinch threshold is a
+# fraction of the frame width (40px on a 640px-wide webcam) so a profile
+# carries over between camera resolutions.
+DEFAULT_PROFILE = {
+    "pinch_threshold": 40 / 640,
+    "tilt_degrees": 45.0,
+    "gesture_cooldown_frames": 10,
+    "neutral_gesture_cooldown_frames": 5,
+}
+
+# --- Profile loading ---
+def load_profile(path=PROFILE_PATH):
+    """Load tuned gesture parameters, falling back to defaults"""
+    profile = dict(DEFAULT_PROFILE)
+    if not os.path.exists(path):
+        return profile
+    with open(path) as f:
+        tuned = json.load(f)
+    for key in DEFAULT_PROFILE:
+        if key in tuned:
+            profile[key] = type(DEFAULT_PROFILE[key])(tuned[key])
+    return profile
+
+def save_profile(profile, path=PROFILE_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({key: profile[key] for key in DEFAULT_PROFILE}, f, indent=2)
+        f.write("\n")
+
+# --- Utility functions ---
+def isFingerExtended(tip, pip):
+    return tip.y < pip.y
+
+def isFist(lm):
+    fingers = [
+        isFingerExtended(lm[8], lm[6]),
+        isFingerExtended(lm[12], lm[10]),
+        isFingerExtended(lm[16], lm[14]),
+        isFingerExtended(lm[20], lm[18]),
+    ]
+    return not any(fingers)
+
+def isOpenHand(lm):
+    fingers = [
+        isFingerExtended(lm[8], lm[6]),   # index
+        isFingerExtended(lm[12], lm[10]), # middle
+        isFingerExtended(lm[16], lm[14]), # ring
+        isFingerExtended(lm[20], lm[18]), # pinky
+    ]
+    return all(fingers)
+
+def is_pinch_between(lm, w, h, i, j, threshold=40):
+    p1 = np.array([lm[i].x * w, lm[i].y * h])
+    p2 = np.array([lm[j].x * w, lm[j].y * h])
+    return np.linalg.norm(p1 - p2) < threshold
+
+# --- Gesture rules ---
+def classify_hands(hands, hand_label, w, h, cooldown, profile=DEFAULT_PROFILE):
+    """Run the gesture rules over one frame's hands.
+
+    Returns (gesture_text, cooldown). Shared by the live detector and the
+    tuning sweep so both score exactly the same logic.
+    """
+    gesture_text = ""
+    pinch_threshold = profile["pinch_threshold"] * w
+    tilt_threshold = math.radians(profile["tilt_degrees"])
+
+    for hand_landmarks in hands:
+        if cooldown > 0:
+            cooldown -= 1
+        else:
+            # --- Gesture Detection ---
+            gesture_text = "NEUTRAL"
+            cooldown = profile["neutral_gesture_cooldown_frames"]
+
+            # DROP (Fist)
+            if isFist(hand_landmarks):
+                gesture_text = "DROP"
+                cooldown = profile["gesture_cooldown_frames"]
+
+            # ROTATE (Thumb-Pinky = Clockwise)
+            elif is_pinch_between(hand_landmarks, w, h, 4, 20, pinch_threshold):
+                if hand_label == "Left":
+                    gesture_text = "ROTATE CW"
+                else:
+                    gesture_text = "ROTATE CCW"
+                cooldown = profile["gesture_cooldown_frames"]
+
+            # ROTATE (Thumb-Index = Counter-Clockwise)
+            elif is_pinch_between(hand_landmarks, w, h, 4, 8, pinch_threshold):
+                if hand_label == "Left":
+                    gesture_text = "ROTATE CCW"
+                else:
+                    gesture_text = "ROTATE CW"
+                cooldown = profile["gesture_cooldown_frames"]
+
+            # MOVE (Horizontal Motion)
+            else:
+                thumb_x = hand_landmarks[4].x
+                pinky_x = hand_landmarks[20].x
+
+                # How sideways the hand is
+                index_mcp = hand_landmarks[5]
+                pinky_mcp = hand_landmarks[17]
+                dx = pinky_mcp.x - index_mcp.x
+                dy = pinky_mcp.y - index_mcp.y
+                angle = abs(math.atan2(dy, dx))  # radians
+                angle = min(angle, math.pi - angle)  # mirror left/right
+                tilted = angle > tilt_threshold
+
+                if tilted:
+                    move_right = thumb_x < pinky_x
+                    if move_right:
+                        gesture_text = "MOVE RIGHT"
+                    else:
+                        gesture_text = "MOVE LEFT"
+
+                    cooldown = profile["gesture_cooldown_frames"]
+    return gesture_text, cooldown
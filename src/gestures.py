@@ -1,12 +1,14 @@
+import time
 import cv2
-import numpy as np
 import mediapipe as mp
-import math
+import metrics
+from gesture_rules import load_profile, classify_hands
 
 # === Settings ===
 MODEL_PATH = "models/hand_landmarker.task"
-GESTURE_COOLDOWN_FRAMES = 10
-NEUTRAL_GESTURE_COOLDOWN_FRAMES = 5
+
+# Tuned thresholds (see tune_gestures.py); defaults if no profile is saved
+PROFILE = load_profile()
 
 # --- Setup MediaPipe ---
 BaseOptions = mp.tasks.BaseOptions
@@ -25,33 +27,6 @@ landmarker = HandLandmarker.create_from_options(options)
 cooldown = 0
 frame_count = 0
 
-# --- Utility functions ---
-def isFingerExtended(tip, pip):
-    return tip.y < pip.y
-
-def isFist(lm):
-    fingers = [
-        isFingerExtended(lm[8], lm[6]),
-        isFingerExtended(lm[12], lm[10]),
-        isFingerExtended(lm[16], lm[14]),
-        isFingerExtended(lm[20], lm[18]),
-    ]
-    return not any(fingers)
-
-def isOpenHand(lm):
-    fingers = [
-        isFingerExtended(lm[8], lm[6]),   # index
-        isFingerExtended(lm[12], lm[10]), # middle
-        isFingerExtended(lm[16], lm[14]), # ring
-        isFingerExtended(lm[20], lm[18]), # pinky
-    ]
-    return all(fingers)
-
-def is_pinch_between(lm, w, h, i, j, threshold=40):
-    p1 = np.array([lm[i].x * w, lm[i].y * h])
-    p2 = np.array([lm[j].x * w, lm[j].y * h])
-    return np.linalg.norm(p1 - p2) < threshold
-
 # --- Main detection function ---
 def detect_gesture(frame):
     global frame_count, cooldown
@@ -60,7 +35,9 @@ def detect_gesture(frame):
     frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
     timestamp_ms = frame_count * 33
+    detect_start = time.perf_counter()
     hand_landmarker_result = landmarker.detect_for_video(mp_image, timestamp_ms)
+    metrics.detect_latency.observe(time.perf_counter() - detect_start)
     frame_count += 1
 
     gesture_text = ""
@@ -73,56 +50,13 @@ def detect_gesture(frame):
                 x_px = int(lm.x * w)
                 y_px = int(lm.y * h)
                 cv2.circle(frame, (x_px, y_px), 5, (0, 255, 0), -1)
-            hand_label = hand_landmarker_result.handedness[0][0].category_name
-
-            if cooldown > 0:
-                cooldown -= 1
-            else:
-                # --- Gesture Detection ---
-                gesture_text = "NEUTRAL"
-                cooldown = NEUTRAL_GESTURE_COOLDOWN_FRAMES
-
-                # DROP (Fist)
-                if isFist(hand_landmarks):
-                    gesture_text = "DROP"
-                    cooldown = GESTURE_COOLDOWN_FRAMES
-
-                # ROTATE (Thumb-Pinky = Clockwise)
-                elif is_pinch_between(hand_landmarks, w, h, 4, 20):
-                    if hand_label == "Left":
-                        gesture_text = "ROTATE CW"
-                    else:
-                        gesture_text = "ROTATE CCW"
-                    cooldown = GESTURE_COOLDOWN_FRAMES
-                
-                # ROTATE (Thumb-Index = Counter-Clockwise)
-                elif is_pinch_between(hand_landmarks, w, h, 4, 8):
-                    if hand_label == "Left":
-                        gesture_text = "ROTATE CCW"
-                    else:
-                        gesture_text = "ROTATE CW"
-                    cooldown = GESTURE_COOLDOWN_FRAMES
-
-                # MOVE (Horizontal Motion)
-                else:
-                    thumb_x = hand_landmarks[4].x
-                    pinky_x = hand_landmarks[20].x
-
-                    # How sideways the hand is
-                    index_mcp = hand_landmarks[5]
-                    pinky_mcp = hand_landmarks[17]
-                    dx = pinky_mcp.x - index_mcp.x
-                    dy = pinky_mcp.y - index_mcp.y
-                    angle = abs(math.atan2(dy, dx))  # radians
-                    angle = min(angle, math.pi - angle)  # mirror left/right
-                    tilted = angle > math.radians(45)
-
-                    if tilted:
-                        move_right = thumb_x < pinky_x
-                        if move_right:
-                            gesture_text = "MOVE RIGHT"
-                        else:
-                            gesture_text = "MOVE LEFT"
-
-                        cooldown = GESTURE_COOLDOWN_FRAMES
+        hand_label = hand_landmarker_result.handedness[0][0].category_name
+
+        gesture_text, cooldown = classify_hands(
+            hand_landmarker_result.hand_landmarks, hand_label, w, h, cooldown, PROFILE
+        )
+        if gesture_text:
+            metrics.gestures_emitted.inc(gesture_text)
+    else:
+        metrics.no_hand_frames.inc()
     return gesture_text
\ No newline at end of file
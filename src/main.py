@@ -1,8 +1,20 @@
+import argparse
 import cv2
 import pygame
 import numpy as np
+import metrics
 from tetris import Game, SCREEN_WIDTH, SCREEN_HEIGHT
 
+# --- Command line options ---
+parser = argparse.ArgumentParser(description="Tetris with hand gestures")
+parser.add_argument("--record", metavar="PATH",
+                    help="save the board and camera feed side by side to a video file")
+parser.add_argument("--ffmpeg", action="store_true",
+                    help="encode the recording with a local ffmpeg instead of OpenCV")
+parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                    help="serve Prometheus metrics on localhost:PORT/metrics")
+args = parser.parse_args()
+
 # --- Pygame init ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -29,6 +41,17 @@ print("Model loaded!")
 # --- Game setup ---
 game = Game()
 
+# --- Optional spectator recording ---
+recorder = None
+if args.record:
+    from recorder import SessionRecorder
+    recorder = SessionRecorder(args.record, use_ffmpeg=args.ffmpeg)
+
+# --- Optional metrics endpoint ---
+if args.metrics_port:
+    metrics.start_server(args.metrics_port)
+    print(f"Serving metrics on http://{metrics.METRICS_HOST}:{args.metrics_port}/metrics")
+
 # --- Gesture-to-action mapping ---
 def apply_gesture_to_game(gesture, game):
     """Map gesture to game action"""
@@ -42,6 +65,9 @@ def apply_gesture_to_game(gesture, game):
         game.rotate_piece(direction=-1)
     elif gesture == "DROP":
         game.hard_drop()
+    else:
+        return
+    metrics.actions_applied.inc(gesture)
 
 # --- Get screen size ---
 # Initialize Pygame display module
@@ -65,10 +91,16 @@ cv2.moveWindow(window_name, window_x, window_y)
 # --- Main integrated loop ---
 def main():
     running = True
+    # Reset the clock so startup (webcam, model load) isn't timed as a frame
+    clock.tick()
     
     while running:
         # Get current time delta
         dt = clock.tick(60)  # 60 FPS
+        metrics.frame_time.observe(dt / 1000)
+        missed = round(dt * 60 / 1000) - 1
+        if missed > 0:
+            metrics.dropped_frames.inc(amount=missed)
         
         # --- Handle pygame events (ESC to quit, P to pause, R to restart, etc.) ---
         for event in pygame.event.get():
@@ -101,6 +133,7 @@ def main():
         # --- Read webcam and detect gesture ---
         ret, frame = cap.read()
         if ret:
+            metrics.camera_frames.inc()
             frame = cv2.flip(frame, 1)
             h, w, _ = frame.shape
             
@@ -115,12 +148,16 @@ def main():
             # Draw gesture on webcam frame
             cv2.putText(frame, gesture_text, (10, 40),
                         cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 2)
+        else:
+            metrics.camera_read_failures.inc()
         
         # --- Update game state ---
         game.update(dt)
         
         # --- Draw tetris game ---
         game.draw()
+        if recorder:
+            recorder.capture(screen, frame if ret else None)
         pygame.display.flip()
         
         # --- Show webcam window ---
@@ -132,6 +169,8 @@ def main():
             running = False
     
     # --- Cleanup ---
+    if recorder:
+        recorder.close()
     cap.release()
     cv2.destroyAllWindows()
     pygame.quit()
@@ -0,0 +1,220 @@
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import cv2
+import numpy as np
+import pygame
+
+# === Settings ===
+RECORD_FPS = 30
+# Frames waiting for the encoder; once full, new frames are dropped
+RECORD_QUEUE_SIZE = 8
+# Seconds between queue depth / dropped frame reports
+RECORD_REPORT_INTERVAL = 10.0
+# Seconds close() waits for the encoder to flush before giving up
+RECORD_CLOSE_TIMEOUT = 10.0
+FFMPEG_ARGS = ["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p"]
+
+
+class SessionRecorder:
+    """Encode the Tetris board and camera feed side by side on a background thread.
+
+    The game loop only copies pixels into a preallocated buffer and hands it
+    off; if the encoder falls behind, frames are dropped instead of stalling
+    the game. Each frame is written once per 1/fps slot it covered, and
+    dropped slots repeat the previous frame, so playback keeps wall-clock
+    time even when the game runs below the recording rate.
+    """
+
+    def __init__(self, path, fps=RECORD_FPS, queue_size=RECORD_QUEUE_SIZE, use_ffmpeg=False):
+        self.path = path
+        self.fps = fps
+        self.use_ffmpeg = use_ffmpeg
+        self.frames_written = 0
+        self.dropped_frames = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        # Buffers cycle free -> queue -> encoder -> free, so none is reused mid-encode.
+        # The encoder holds on to the last frame to repeat it over dropped slots.
+        self._free = queue.Queue()
+        self._buffers_allocated = 0
+        self._max_buffers = queue_size + 3
+        # Slots since the last queued frame that no frame was queued for
+        self._dropped_slots = 0
+        self._camera = None
+        self._size = None
+        self._next_capture = 0.0
+        self._writer = None
+        self._thread = None
+        self.failed = False
+
+        # Catch setup problems at startup rather than inside the encoder thread
+        if use_ffmpeg and shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg not found on PATH")
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            raise RuntimeError(f"Recording directory does not exist: {directory}")
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        return (f"queue {self.queue_depth}/{self._queue.maxsize}, "
+                f"{self.frames_written} written, {self.dropped_frames} dropped")
+
+    # --- Game loop side ---
+    def capture(self, surface, camera_frame=None):
+        """Composite the board surface with the camera frame and queue it"""
+        if self.failed:
+            return
+        now = time.perf_counter()
+        if now < self._next_capture:
+            return
+
+        board_w, board_h = surface.get_size()
+        if camera_frame is not None:
+            self._update_camera(camera_frame, board_h)
+        if self._camera is None:
+            return  # wait for the first camera frame to fix the layout
+
+        # Number of 1/fps slots this frame stands in for
+        if self._thread is None:
+            slots = 1
+            self._next_capture = now + 1.0 / self.fps
+        else:
+            slots = 1 + int((now - self._next_capture) * self.fps)
+            self._next_capture += slots / self.fps
+        if self._size is None:
+            self._size = (board_h, board_w + self._camera.shape[1])
+        if self._thread is None:
+            try:
+                self._writer = self._open_writer(self._size[1], self._size[0])
+            except (OSError, RuntimeError) as e:
+                self._fail(e)
+                return
+            self._start()
+
+        buffer = self._take_buffer()
+        if buffer is None:
+            self.dropped_frames += 1
+            self._dropped_slots += slots
+            return
+
+        # pixels3d is a (w, h, RGB) view of the surface; transpose and flip the
+        # channels in the view so the only copy is the one into the BGR buffer
+        pixels = pygame.surfarray.pixels3d(surface)
+        np.copyto(buffer[:, :board_w], pixels.transpose(1, 0, 2)[:, :, ::-1])
+        del pixels  # unlock the surface before the next draw/flip
+        buffer[:, board_w:] = self._camera
+
+        try:
+            self._queue.put_nowait((buffer, self._dropped_slots, slots))
+            self._dropped_slots = 0
+        except queue.Full:
+            self._free.put(buffer)
+            self.dropped_frames += 1
+            self._dropped_slots += slots
+
+    def _update_camera(self, frame, board_h):
+        h, w = frame.shape[:2]
+        if self._camera is None:
+            # Scale the camera to the board height; encoders want even sizes
+            cam_w = int(round(w * board_h / h)) // 2 * 2
+            self._camera = np.zeros((board_h, cam_w, 3), dtype=np.uint8)
+        cam_h, cam_w = self._camera.shape[:2]
+        cv2.resize(frame, (cam_w, cam_h), dst=self._camera, interpolation=cv2.INTER_AREA)
+
+    def _take_buffer(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        if self._buffers_allocated >= self._max_buffers:
+            return None
+        self._buffers_allocated += 1
+        return np.zeros((*self._size, 3), dtype=np.uint8)
+
+    # --- Encoder side ---
+    def _start(self):
+        self._thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self._thread.start()
+
+    def _fail(self, error):
+        self.failed = True
+        print(f"Recording to {self.path} stopped: {error}")
+
+    def _open_writer(self, width, height):
+        if self.use_ffmpeg:
+            cmd = [
+                "ffmpeg", "-loglevel", "error", "-y",
+                "-f", "rawvideo", "-pix_fmt", "bgr24",
+                "-s", f"{width}x{height}", "-r", str(self.fps),
+                "-i", "-", *FFMPEG_ARGS, self.path,
+            ]
+            return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+        writer = cv2.VideoWriter(self.path, fourcc, self.fps, (width, height))
+        if not writer.isOpened():
+            raise RuntimeError(f"Could not open video writer for {self.path}")
+        return writer
+
+    def _write(self, writer, buffer, count):
+        for _ in range(count):
+            if self.use_ffmpeg:
+                writer.stdin.write(buffer.data)
+            else:
+                writer.write(buffer)
+            self.frames_written += 1
+
+    def _encode_loop(self):
+        writer = self._writer
+        last = None
+        next_report = time.perf_counter() + RECORD_REPORT_INTERVAL
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    # close() has stopped capture, so the trailing gap is final
+                    if last is not None:
+                        self._write(writer, last, self._dropped_slots)
+                    break
+                buffer, dropped_slots, slots = item
+                if last is not None:
+                    self._write(writer, last, dropped_slots)
+                    self._free.put(last)
+                self._write(writer, buffer, slots)
+                last = buffer
+
+                if time.perf_counter() >= next_report:
+                    next_report += RECORD_REPORT_INTERVAL
+                    print(f"Recorder: {self.stats()}")
+        except Exception as e:
+            self._fail(e)
+        finally:
+            try:
+                if self.use_ffmpeg:
+                    writer.stdin.close()
+                    writer.wait()
+                else:
+                    writer.release()
+            except OSError:
+                pass
+
+    def close(self):
+        """Flush queued frames and finalize the file"""
+        if self._thread is not None:
+            if self._thread.is_alive():
+                try:
+                    self._queue.put(None, timeout=RECORD_CLOSE_TIMEOUT)
+                except queue.Full:
+                    pass
+                self._thread.join(RECORD_CLOSE_TIMEOUT)
+            if self._thread.is_alive():
+                print(f"Recorder: encoder did not finish within {RECORD_CLOSE_TIMEOUT}s")
+            self._thread = None
+        status = "failed" if self.failed else "saved"
+        print(f"Recording {status} ({self.path}): {self.stats()}")
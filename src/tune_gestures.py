@@ -0,0 +1,201 @@
+"""Sweep gesture thresholds over labeled landmark recordings.
+
+Each recording is a JSON file:
+
+    {
+      "width": 640, "height": 480,
+      "frames": [
+        {"label": "DROP",
+         "handedness": "Right",
+         "hands": [[[x, y, z], ... 21 landmarks ...]]},
+        ...
+      ]
+    }
+
+`label` is the gesture the player is making on that frame ("" or "NEUTRAL"
+when idle) and `hands` holds MediaPipe's normalized landmarks, one list per
+detected hand. Every parameter setting replays the recordings through the
+same rules as the game (gesture_rules.classify_hands) and the best one is
+written to the profile that gestures.py loads at startup.
+
+Usage:
+    python src/tune_gestures.py recordings/*.json
+    python src/tune_gestures.py recordings/*.json --random 500 --workers 8
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from gesture_rules import DEFAULT_PROFILE, PROFILE_PATH, classify_hands, save_profile
+
+# === Settings ===
+SEARCH_SPACE = {
+    "pinch_threshold": [0.03, 0.04, 0.05, 0.0625, 0.075, 0.09, 0.105],
+    "tilt_degrees": [30.0, 35.0, 40.0, 45.0, 50.0, 55.0, 60.0],
+    "gesture_cooldown_frames": [4, 6, 8, 10, 12, 15],
+    "neutral_gesture_cooldown_frames": [0, 2, 3, 5, 8],
+}
+# Which way is stricter for each parameter (fewer triggers); breaks ties
+# between values the same distance from the default
+STRICTER = {
+    "pinch_threshold": -1,
+    "tilt_degrees": 1,
+    "gesture_cooldown_frames": 1,
+    "neutral_gesture_cooldown_frames": 1,
+}
+# Frames of latency that cost as much as one percent of accuracy
+LATENCY_WEIGHT = 0.01
+
+Landmark = namedtuple("Landmark", ["x", "y", "z"])
+
+# --- Recording loading ---
+def load_recording(path):
+    with open(path) as f:
+        data = json.load(f)
+    frames = []
+    for frame in data["frames"]:
+        hands = [[Landmark(*point) for point in hand] for hand in frame.get("hands", [])]
+        label = frame.get("label", "")
+        if label == "NEUTRAL":
+            label = ""
+        frames.append((label, frame.get("handedness", "Right"), hands))
+    return data["width"], data["height"], frames
+
+def label_segments(frames):
+    """Return (start, end, label) for each run of one non-idle label"""
+    segments = []
+    start = None
+    for i, (label, _, _) in enumerate(frames + [("", None, [])]):
+        if start is not None and label != frames[start][0]:
+            segments.append((start, i, frames[start][0]))
+            start = None
+        if start is None and label:
+            start = i
+    return segments
+
+# --- Scoring ---
+def evaluate(profile, recordings):
+    """Replay all recordings with one profile and score the result"""
+    hits = 0
+    total_segments = 0
+    latencies = []
+    emitted = 0
+    false_triggers = 0
+
+    for w, h, frames in recordings:
+        cooldown = 0
+        emissions = []
+        for i, (_, hand_label, hands) in enumerate(frames):
+            if not hands:
+                continue
+            gesture_text, cooldown = classify_hands(hands, hand_label, w, h, cooldown, profile)
+            if gesture_text and gesture_text != "NEUTRAL":
+                emissions.append((i, gesture_text))
+
+        emitted += len(emissions)
+        for i, gesture_text in emissions:
+            if frames[i][0] != gesture_text:
+                false_triggers += 1
+
+        for start, end, label in label_segments(frames):
+            total_segments += 1
+            matches = [i for i, gesture_text in emissions
+                       if start <= i < end and gesture_text == label]
+            if matches:
+                hits += 1
+                latencies.append(matches[0] - start)
+                # Each repeat is another game action (e.g. a second hard drop)
+                false_triggers += len(matches) - 1
+
+    accuracy = hits / total_segments if total_segments else 0.0
+    false_trigger_rate = false_triggers / emitted if emitted else 0.0
+    mean_latency = sum(latencies) / len(latencies) if latencies else float("inf")
+    score = accuracy - false_trigger_rate
+    if latencies:
+        score -= LATENCY_WEIGHT * mean_latency
+    return {
+        "profile": profile,
+        "accuracy": accuracy,
+        "false_trigger_rate": false_trigger_rate,
+        "mean_latency_frames": mean_latency,
+        "score": score,
+    }
+
+# --- Worker pool ---
+# Recordings are loaded once per worker instead of pickled with every task
+_recordings = None
+
+def _init_worker(paths):
+    global _recordings
+    _recordings = [load_recording(path) for path in paths]
+
+def _evaluate_in_worker(profile):
+    return evaluate(profile, _recordings)
+
+def candidate_profiles(random_samples=0, seed=0):
+    keys = list(SEARCH_SPACE)
+    grid = list(itertools.product(*(SEARCH_SPACE[key] for key in keys)))
+    if random_samples:
+        # Sample without replacement so N means N distinct settings
+        rng = random.Random(seed)
+        grid = rng.sample(grid, min(random_samples, len(grid)))
+    for values in grid:
+        yield dict(zip(keys, values))
+
+def sweep(paths, random_samples=0, workers=None, seed=0):
+    candidates = list(candidate_profiles(random_samples, seed))
+    if DEFAULT_PROFILE not in candidates:
+        candidates.append(dict(DEFAULT_PROFILE))
+    chunksize = max(1, len(candidates) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(paths,)
+    ) as pool:
+        results = list(pool.map(_evaluate_in_worker, candidates, chunksize=chunksize))
+    return sorted(results, key=rank_key, reverse=True)
+
+def rank_key(result):
+    """Best score first; on ties, each parameter prefers the value closest to
+    its default, so parameters the recordings never exercise keep it"""
+    profile = result["profile"]
+    key = [round(result["score"], 9)]
+    for name in SEARCH_SPACE:
+        key.append(-abs(profile[name] - DEFAULT_PROFILE[name]))
+        key.append(STRICTER[name] * profile[name])
+    return tuple(key)
+
+def format_result(result):
+    return (
+        f"score={result['score']:.3f} "
+        f"accuracy={result['accuracy']:.3f} "
+        f"false_triggers={result['false_trigger_rate']:.3f} "
+        f"latency={result['mean_latency_frames']:.1f}f "
+        f"{result['profile']}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune gesture thresholds on recorded landmarks")
+    parser.add_argument("recordings", nargs="+", help="labeled landmark recording JSON files")
+    parser.add_argument("--random", type=int, default=0, metavar="N",
+                        help="sample N random settings instead of the full grid")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=5, help="number of results to print")
+    parser.add_argument("--output", default=PROFILE_PATH, help="where to write the best profile")
+    args = parser.parse_args()
+
+    baseline = evaluate(DEFAULT_PROFILE, [load_recording(path) for path in args.recordings])
+    print(f"Default:  {format_result(baseline)}")
+
+    results = sweep(args.recordings, args.random, args.workers, args.seed)
+    for rank, result in enumerate(results[:args.top], 1):
+        print(f"#{rank}: {format_result(result)}")
+
+    save_profile(results[0]["profile"], args.output)
+    print(f"Saved best profile to {args.output}")
+
+if __name__ == "__main__":
+    main()